@@ -10,13 +10,20 @@ from werkzeug.utils import secure_filename
 import sqlite3
 import uuid
 import base64
+import time
+from PIL import Image, ImageOps
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 app.config['SESSION_TYPE'] = 'filesystem'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['IMAGE_MAX_DIMENSION'] = 1600  # longest side sent to Gemini Vision
+app.config['IMAGE_JPEG_QUALITY'] = 85
+app.config['THUMBNAIL_JPEG_QUALITY'] = 75
+app.config['THUMBNAIL_SIZE'] = (256, 256)
 ALLOWED_EXTENSIONS = {'pdf', 'png', 'jpg', 'jpeg', 'gif', 'txt', 'doc', 'docx'}
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
 # Create upload directory if it doesn't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -175,27 +182,34 @@ def auth_status():
     return jsonify({'authenticated': False}), 200
 
 # Profile management endpoints
+def fetch_profile(c, user_id):
+    c.execute('SELECT * FROM user_profiles WHERE user_id = ?', (user_id,))
+    profile = c.fetchone()
+    
+    if not profile:
+        return None
+    
+    return {
+        'full_name': profile['full_name'],
+        'age': profile['age'],
+        'gender': profile['gender'],
+        'medical_history': profile['medical_history'],
+        'allergies': profile['allergies'],
+        'current_medications': profile['current_medications'],
+        'health_goals': profile['health_goals']
+    }
+
 @app.route('/api/profile', methods=['GET'])
 def get_profile():
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
     conn = get_db()
-    c = conn.cursor()
-    c.execute('SELECT * FROM user_profiles WHERE user_id = ?', (session['user_id'],))
-    profile = c.fetchone()
+    profile = fetch_profile(conn.cursor(), session['user_id'])
     conn.close()
     
     if profile:
-        return jsonify({
-            'full_name': profile['full_name'],
-            'age': profile['age'],
-            'gender': profile['gender'],
-            'medical_history': profile['medical_history'],
-            'allergies': profile['allergies'],
-            'current_medications': profile['current_medications'],
-            'health_goals': profile['health_goals']
-        }), 200
+        return jsonify(profile), 200
     
     return jsonify({'error': 'Profile not found'}), 404
 
@@ -310,27 +324,78 @@ Important guidelines:
     except Exception as e:
         return jsonify({'error': f'Error generating response: {str(e)}'}), 500
 
+def fetch_chat_history(c, user_id):
+    c.execute('SELECT message, response, timestamp FROM chat_history WHERE user_id = ? ORDER BY timestamp DESC LIMIT 50',
+              (user_id,))
+    return [{'message': h['message'], 'response': h['response'], 'timestamp': h['timestamp']} 
+            for h in c.fetchall()]
+
 @app.route('/api/chat/history', methods=['GET'])
 def get_chat_history():
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
     conn = get_db()
-    c = conn.cursor()
-    c.execute('SELECT message, response, timestamp FROM chat_history WHERE user_id = ? ORDER BY timestamp DESC LIMIT 50',
-              (session['user_id'],))
-    history = c.fetchall()
+    history = fetch_chat_history(conn.cursor(), session['user_id'])
     conn.close()
     
-    return jsonify({
-        'history': [{'message': h['message'], 'response': h['response'], 'timestamp': h['timestamp']} 
-                    for h in history]
-    }), 200
+    return jsonify({'history': history}), 200
 
 # File upload endpoints
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def derived_image_paths(filename):
+    """Paths of the cached analysis image and thumbnail for an uploaded image"""
+    base = os.path.join(app.config['UPLOAD_FOLDER'], filename.rsplit('.', 1)[0])
+    return f"{base}.analysis.jpg", f"{base}.thumb.jpg"
+
+def save_jpeg(image, path, quality):
+    # Write to a temp file first so concurrent requests never read a partial image
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        image.save(tmp_path, 'JPEG', quality=quality, optimize=True)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def preprocess_image(filename):
+    """Downscale, strip metadata and re-encode an uploaded image for analysis.
+
+    The derived image and its thumbnail are cached next to the original and
+    reused on later calls. Returns the path of the analysis image.
+    """
+    analysis_path, thumb_path = derived_image_paths(filename)
+    if os.path.exists(analysis_path) and os.path.exists(thumb_path):
+        return analysis_path
+    
+    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    with Image.open(filepath) as original:
+        # Apply EXIF orientation before the metadata is dropped on re-encode
+        image = ImageOps.exif_transpose(original)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        
+        # Pillow re-saves entries such as JPEG/GIF comments from info, so drop
+        # all of it to keep patient metadata out of the derived images
+        image.info = {}
+        
+        max_dimension = app.config['IMAGE_MAX_DIMENSION']
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+        save_jpeg(image, analysis_path, app.config['IMAGE_JPEG_QUALITY'])
+        
+        image.thumbnail(app.config['THUMBNAIL_SIZE'], Image.LANCZOS)
+        save_jpeg(image, thumb_path, app.config['THUMBNAIL_JPEG_QUALITY'])
+    
+    return analysis_path
+
 @app.route('/api/files/upload', methods=['POST'])
 def upload_file():
     if 'user_id' not in session:
@@ -380,29 +445,29 @@ def upload_file():
     except Exception as e:
         return jsonify({'error': f'Upload failed: {str(e)}'}), 500
 
+def fetch_files(c, user_id):
+    c.execute('''SELECT id, original_filename, file_type, file_size, description, upload_date 
+                 FROM uploaded_files WHERE user_id = ? ORDER BY upload_date DESC''',
+              (user_id,))
+    return [{
+        'id': f['id'],
+        'filename': f['original_filename'],
+        'file_type': f['file_type'],
+        'file_size': f['file_size'],
+        'description': f['description'],
+        'upload_date': f['upload_date']
+    } for f in c.fetchall()]
+
 @app.route('/api/files', methods=['GET'])
 def get_files():
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
     conn = get_db()
-    c = conn.cursor()
-    c.execute('''SELECT id, original_filename, file_type, file_size, description, upload_date 
-                 FROM uploaded_files WHERE user_id = ? ORDER BY upload_date DESC''',
-              (session['user_id'],))
-    files = c.fetchall()
+    files = fetch_files(conn.cursor(), session['user_id'])
     conn.close()
     
-    return jsonify({
-        'files': [{
-            'id': f['id'],
-            'filename': f['original_filename'],
-            'file_type': f['file_type'],
-            'file_size': f['file_size'],
-            'description': f['description'],
-            'upload_date': f['upload_date']
-        } for f in files]
-    }), 200
+    return jsonify({'files': files}), 200
 
 @app.route('/api/files/<file_id>', methods=['DELETE'])
 def delete_file(file_id):
@@ -424,6 +489,11 @@ def delete_file(file_id):
     if os.path.exists(filepath):
         os.remove(filepath)
     
+    # Delete cached analysis image and thumbnail
+    for derived_path in derived_image_paths(file_record['filename']):
+        if os.path.exists(derived_path):
+            os.remove(derived_path)
+    
     # Delete database record
     c.execute('DELETE FROM uploaded_files WHERE id = ?', (file_id,))
     conn.commit()
@@ -431,6 +501,28 @@ def delete_file(file_id):
     
     return jsonify({'message': 'File deleted successfully'}), 200
 
+@app.route('/api/files/<file_id>/thumbnail', methods=['GET'])
+def get_file_thumbnail(file_id):
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    conn = get_db()
+    c = conn.cursor()
+    c.execute('SELECT filename, file_type FROM uploaded_files WHERE id = ? AND user_id = ?',
+              (file_id, session['user_id']))
+    file_record = c.fetchone()
+    conn.close()
+    
+    if not file_record or file_record['file_type'] not in IMAGE_EXTENSIONS:
+        return jsonify({'error': 'Thumbnail not found'}), 404
+    
+    try:
+        preprocess_image(file_record['filename'])
+        _, thumb_path = derived_image_paths(file_record['filename'])
+        return send_file(os.path.abspath(thumb_path), mimetype='image/jpeg')
+    except Exception as e:
+        return jsonify({'error': f'Thumbnail generation failed: {str(e)}'}), 500
+
 @app.route('/api/files/analyze/<file_id>', methods=['POST'])
 def analyze_file(file_id):
     """Analyze an uploaded file using Gemini Vision API for images or text extraction"""
@@ -449,13 +541,29 @@ def analyze_file(file_id):
     
     try:
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], file_record['filename'])
+        stats = None
         
         # For images, use Gemini Vision
-        if file_record['file_type'] in ['png', 'jpg', 'jpeg', 'gif']:
+        if file_record['file_type'] in IMAGE_EXTENSIONS:
             model = genai.GenerativeModel('gemini-1.5-flash')
             
+            # Always send the downscaled, metadata-free copy so EXIF/GPS data never
+            # leaves the server, even when it is not smaller than the original.
+            # The original is only sent if preprocessing fails, or when the caller
+            # asks for it (?preprocess=false) to compare the two paths
+            started = time.perf_counter()
+            image_path = filepath
+            mime_type = f'image/{file_record["file_type"]}'
+            if request.args.get('preprocess', 'true').lower() != 'false':
+                try:
+                    image_path = preprocess_image(file_record['filename'])
+                    mime_type = 'image/jpeg'
+                except Exception as e:
+                    app.logger.warning(f'Image preprocessing failed for {file_id}, sending original: {e}')
+            preprocess_ms = (time.perf_counter() - started) * 1000
+            
             # Read and encode image
-            with open(filepath, 'rb') as f:
+            with open(image_path, 'rb') as f:
                 image_data = f.read()
             
             prompt = """Analyze this medical document or health-related image. 
@@ -463,9 +571,19 @@ def analyze_file(file_id):
             If this appears to be a medical report or lab result, highlight key findings.
             Be thorough but clear in your analysis."""
             
-            response = model.generate_content([prompt, {'mime_type': f'image/{file_record["file_type"]}', 'data': image_data}])
+            started = time.perf_counter()
+            response = model.generate_content([prompt, {'mime_type': mime_type, 'data': image_data}])
             analysis = response.text
             
+            stats = {
+                'preprocessed': image_path != filepath,
+                'original_bytes': os.path.getsize(filepath),
+                'sent_bytes': len(image_data),
+                'preprocess_ms': round(preprocess_ms, 1),
+                'analysis_ms': round((time.perf_counter() - started) * 1000, 1)
+            }
+            app.logger.info(f'Image analysis stats for {file_id}: {stats}')
+            
         else:
             # For text files, read and analyze
             with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
@@ -481,10 +599,14 @@ def analyze_file(file_id):
             response = model.generate_content(prompt)
             analysis = response.text
         
-        return jsonify({
+        result = {
             'filename': file_record['original_filename'],
             'analysis': analysis
-        }), 200
+        }
+        if stats:
+            result['stats'] = stats
+        
+        return jsonify(result), 200
         
     except Exception as e:
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
@@ -533,30 +655,30 @@ def create_followup():
         'next_date': next_date.isoformat()
     }), 201
 
+def fetch_followups(c, user_id):
+    c.execute('''SELECT id, title, frequency, next_date, last_completed, notes, is_active
+                 FROM followups WHERE user_id = ? AND is_active = 1 ORDER BY next_date ASC''',
+              (user_id,))
+    return [{
+        'id': f['id'],
+        'title': f['title'],
+        'frequency': f['frequency'],
+        'next_date': f['next_date'],
+        'last_completed': f['last_completed'],
+        'notes': f['notes'],
+        'is_overdue': datetime.fromisoformat(f['next_date']) < datetime.now()
+    } for f in c.fetchall()]
+
 @app.route('/api/followups', methods=['GET'])
 def get_followups():
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
     conn = get_db()
-    c = conn.cursor()
-    c.execute('''SELECT id, title, frequency, next_date, last_completed, notes, is_active
-                 FROM followups WHERE user_id = ? AND is_active = 1 ORDER BY next_date ASC''',
-              (session['user_id'],))
-    followups = c.fetchall()
+    followups = fetch_followups(conn.cursor(), session['user_id'])
     conn.close()
     
-    return jsonify({
-        'followups': [{
-            'id': f['id'],
-            'title': f['title'],
-            'frequency': f['frequency'],
-            'next_date': f['next_date'],
-            'last_completed': f['last_completed'],
-            'notes': f['notes'],
-            'is_overdue': datetime.fromisoformat(f['next_date']) < datetime.now()
-        } for f in followups]
-    }), 200
+    return jsonify({'followups': followups}), 200
 
 @app.route('/api/followups/<followup_id>/complete', methods=['POST'])
 def complete_followup(followup_id):
@@ -678,6 +800,49 @@ def get_followup_history(followup_id):
         } for h in history]
     }), 200
 
+# Startup bootstrap endpoint
+BOOTSTRAP_SECTIONS = {
+    'profile': fetch_profile,
+    'chat_history': fetch_chat_history,
+    'files': fetch_files,
+    'followups': fetch_followups
+}
+
+@app.route('/api/bootstrap', methods=['GET'])
+def bootstrap():
+    """Return auth status plus the requested startup data in a single round-trip.
+
+    Sections are chosen with ?include=profile,chat_history,files,followups
+    (all by default) and read on one connection inside one read transaction,
+    so they reflect a consistent snapshot of the database.
+    """
+    if 'user_id' not in session:
+        return jsonify({'auth': {'authenticated': False}}), 200
+    
+    include = request.args.get('include')
+    if include:
+        sections = [name.strip() for name in include.split(',') if name.strip()]
+    else:
+        sections = list(BOOTSTRAP_SECTIONS)
+    
+    unknown = [name for name in sections if name not in BOOTSTRAP_SECTIONS]
+    if unknown:
+        return jsonify({'error': f'Unknown sections: {", ".join(unknown)}'}), 400
+    
+    result = {'auth': {'authenticated': True, 'username': session.get('username')}}
+    
+    conn = get_db()
+    c = conn.cursor()
+    try:
+        c.execute('BEGIN')
+        for name in sections:
+            result[name] = BOOTSTRAP_SECTIONS[name](c, session['user_id'])
+        conn.commit()
+    finally:
+        conn.close()
+    
+    return jsonify(result), 200
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'service': 'MedLM Health Chatbot'}), 200
@@ -0,0 +1,118 @@
+"""Compare frontend cold-start data loading: separate requests vs /api/bootstrap.
+
+Runs against a throwaway database seeded with one user, so it is safe to run
+next to a real health_chatbot.db:
+
+    python benchmark_bootstrap.py --iterations 200 --rtt-ms 40
+
+The timed sequences are the ones the frontend sends. Before bootstrap, App.js
+requested /api/auth/status and then the mounted page requested its own data
+(/api/chat/history on /chat, /api/profile on /profile). Now App.js sends one
+/api/bootstrap?include=profile,chat_history call.
+
+Server time is measured with the Flask test client and reported on its own.
+The time-to-interactive column is an estimate, not a frontend measurement: it
+adds --rtt-ms for each sequential round-trip to the measured server time, so
+the gap between the two paths is mostly the simulated RTT.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+BOOTSTRAP_REQUEST = '/api/bootstrap?include=profile,chat_history'
+LEGACY_SEQUENCES = {
+    '/chat (separate)': ['/api/auth/status', '/api/chat/history'],
+    '/profile (separate)': ['/api/auth/status', '/api/profile']
+}
+
+
+def seed(app_module, user_id):
+    conn = app_module.get_db()
+    c = conn.cursor()
+    now = datetime.now()
+    c.execute('INSERT INTO users (id, username, password_hash, created_at) VALUES (?, ?, ?, ?)',
+              (user_id, 'benchmark', 'x', now.isoformat()))
+    c.execute('''INSERT INTO user_profiles (user_id, full_name, age, medical_history, updated_at)
+                 VALUES (?, ?, ?, ?, ?)''',
+              (user_id, 'Bench User', 42, 'Hypertension', now.isoformat()))
+    for i in range(50):
+        c.execute('INSERT INTO chat_history (id, user_id, message, response, timestamp) VALUES (?, ?, ?, ?, ?)',
+                  (str(uuid.uuid4()), user_id, f'Question {i}', 'Answer ' * 200,
+                   (now - timedelta(minutes=i)).isoformat()))
+    for i in range(20):
+        c.execute('''INSERT INTO uploaded_files
+                     (id, user_id, filename, original_filename, file_type, file_size, description, upload_date)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                  (str(uuid.uuid4()), user_id, f'{uuid.uuid4()}.pdf', f'report-{i}.pdf',
+                   'pdf', 1024 * i, 'Lab report', now.isoformat()))
+    for i in range(10):
+        c.execute('''INSERT INTO followups (id, user_id, title, frequency, next_date, notes, created_at)
+                     VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                  (str(uuid.uuid4()), user_id, f'Check-in {i}', 'weekly',
+                   (now + timedelta(days=i)).isoformat(), '', now.isoformat()))
+    conn.commit()
+    conn.close()
+
+
+def timed_get(client, path):
+    started = time.perf_counter()
+    response = client.get(path)
+    elapsed = (time.perf_counter() - started) * 1000
+    assert response.status_code == 200, f'{path} returned {response.status_code}'
+    return elapsed
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, int(len(ordered) * pct / 100) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--rtt-ms', type=float, default=40.0,
+                        help='simulated network round-trip time per request on the critical path')
+    args = parser.parse_args()
+
+    # app.py creates its database and upload folder relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix='bootstrap-bench-'))
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import app as app_module
+
+    user_id = str(uuid.uuid4())
+    seed(app_module, user_id)
+
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+        sess['username'] = 'benchmark'
+
+    sequences = dict(LEGACY_SEQUENCES)
+    sequences['bootstrap'] = [BOOTSTRAP_REQUEST]
+
+    server_ms = {label: [] for label in sequences}
+    for _ in range(args.iterations):
+        for label, paths in sequences.items():
+            # Each request waits for the previous one, as in the browser
+            server_ms[label].append(sum(timed_get(client, path) for path in paths))
+
+    print(f'Server time (measured), {args.iterations} iterations:')
+    for label, samples in server_ms.items():
+        print(f'  {label:>20}: {len(sequences[label])} requests, '
+              f'median {statistics.median(samples):.2f} ms, '
+              f'p95 {percentile(samples, 95):.2f} ms')
+
+    print(f'Time-to-interactive (estimate: server median + {args.rtt_ms:g} ms per round-trip):')
+    for label, samples in server_ms.items():
+        round_trips = len(sequences[label])
+        estimate = statistics.median(samples) + round_trips * args.rtt_ms
+        print(f'  {label:>20}: {round_trips} round-trips, {estimate:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -15,24 +15,38 @@ function App() {
   const [authenticated, setAuthenticated] = useState(false);
   const [loading, setLoading] = useState(true);
   const [username, setUsername] = useState('');
+  const [bootstrap, setBootstrap] = useState({});
 
   useEffect(() => {
-    checkAuthStatus();
+    loadBootstrap();
   }, []);
 
-  const checkAuthStatus = async () => {
+  // Fetch auth status and the initial page data in a single request
+  const loadBootstrap = async () => {
     try {
-      const response = await axios.get('/api/auth/status');
-      setAuthenticated(response.data.authenticated);
-      setUsername(response.data.username || '');
+      const response = await axios.get('/api/bootstrap', {
+        params: { include: 'profile,chat_history' }
+      });
+      const { auth, ...sections } = response.data;
+      setAuthenticated(auth.authenticated);
+      setUsername(auth.username || '');
+      setBootstrap(sections);
     } catch (error) {
-      console.error('Error checking auth status:', error);
+      console.error('Error loading startup data:', error);
       setAuthenticated(false);
     } finally {
       setLoading(false);
     }
   };
 
+  // Bootstrap data is only valid for the first mount; later mounts refetch
+  const consumeBootstrap = (section) => {
+    setBootstrap(prev => {
+      const { [section]: _, ...rest } = prev;
+      return rest;
+    });
+  };
+
   const handleLogin = (username) => {
     setAuthenticated(true);
     setUsername(username);
@@ -43,6 +57,7 @@ function App() {
       await axios.post('/api/auth/logout');
       setAuthenticated(false);
       setUsername('');
+      setBootstrap({});
     } catch (error) {
       console.error('Error logging out:', error);
     }
@@ -81,7 +96,12 @@ function App() {
             path="/chat" 
             element={
               authenticated ? 
-                <Chat username={username} onLogout={handleLogout} /> : 
+                <Chat 
+                  username={username} 
+                  onLogout={handleLogout} 
+                  initialHistory={bootstrap.chat_history} 
+                  onInitialHistoryUsed={() => consumeBootstrap('chat_history')} 
+                /> : 
                 <Navigate to="/login" />
             } 
           />
@@ -89,7 +109,12 @@ function App() {
             path="/profile" 
             element={
               authenticated ? 
-                <Profile username={username} onLogout={handleLogout} /> : 
+                <Profile 
+                  username={username} 
+                  onLogout={handleLogout} 
+                  initialProfile={bootstrap.profile} 
+                  onInitialProfileUsed={() => consumeBootstrap('profile')} 
+                /> : 
                 <Navigate to="/login" />
             } 
           />
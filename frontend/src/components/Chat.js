@@ -2,7 +2,7 @@ import React, { useState, useEffect, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 
-function Chat({ username, onLogout }) {
+function Chat({ username, onLogout, initialHistory, onInitialHistoryUsed }) {
   const [messages, setMessages] = useState([]);
   const [inputMessage, setInputMessage] = useState('');
   const [loading, setLoading] = useState(false);
@@ -18,28 +18,35 @@ function Chat({ username, onLogout }) {
   }, [messages]);
 
   useEffect(() => {
-    loadChatHistory();
+    if (initialHistory) {
+      showChatHistory(initialHistory);
+      onInitialHistoryUsed();
+    } else {
+      loadChatHistory();
+    }
   }, []);
 
+  const showChatHistory = (history) => {
+    const formattedMessages = [...history].reverse().flatMap(item => [
+      {
+        type: 'user',
+        content: item.message,
+        timestamp: item.timestamp
+      },
+      {
+        type: 'ai',
+        content: item.response,
+        timestamp: item.timestamp
+      }
+    ]);
+    
+    setMessages(formattedMessages);
+  };
+
   const loadChatHistory = async () => {
     try {
       const response = await axios.get('/api/chat/history');
-      const history = response.data.history.reverse();
-      
-      const formattedMessages = history.flatMap(item => [
-        {
-          type: 'user',
-          content: item.message,
-          timestamp: item.timestamp
-        },
-        {
-          type: 'ai',
-          content: item.response,
-          timestamp: item.timestamp
-        }
-      ]);
-      
-      setMessages(formattedMessages);
+      showChatHistory(response.data.history);
     } catch (error) {
       console.error('Error loading chat history:', error);
     }
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import axios from 'axios';
 
-function Profile({ username, onLogout }) {
+function Profile({ username, onLogout, initialProfile, onInitialProfileUsed }) {
   const [profile, setProfile] = useState({
     full_name: '',
     age: '',
@@ -17,21 +17,31 @@ function Profile({ username, onLogout }) {
   const navigate = useNavigate();
 
   useEffect(() => {
-    loadProfile();
+    // null means the user has no profile row yet; show the empty form
+    if (initialProfile !== undefined) {
+      showProfile(initialProfile || {});
+      onInitialProfileUsed();
+    } else {
+      loadProfile();
+    }
   }, []);
 
+  const showProfile = (data) => {
+    setProfile({
+      full_name: data.full_name || '',
+      age: data.age || '',
+      gender: data.gender || '',
+      medical_history: data.medical_history || '',
+      allergies: data.allergies || '',
+      current_medications: data.current_medications || '',
+      health_goals: data.health_goals || ''
+    });
+  };
+
   const loadProfile = async () => {
     try {
       const response = await axios.get('/api/profile');
-      setProfile({
-        full_name: response.data.full_name || '',
-        age: response.data.age || '',
-        gender: response.data.gender || '',
-        medical_history: response.data.medical_history || '',
-        allergies: response.data.allergies || '',
-        current_medications: response.data.current_medications || '',
-        health_goals: response.data.health_goals || ''
-      });
+      showProfile(response.data);
     } catch (error) {
       console.error('Error loading profile:', error);
     }